@@ -3,6 +3,7 @@ from typing import Any, Dict, List
 from pydantic import ValidationError
 
 from .llm import LLMClient
+from .profiling import TurnProfiler, stage
 from .schemas import ChatResponse, ConversationState, LoanCreate
 from .services import LoanService, ConversationService
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -30,30 +31,50 @@ class AgentOrchestrator:
         llm: LLMClient,
         loan_service: LoanService,
         conversation_service: ConversationService,
+        profiler: TurnProfiler | None = None,
     ):
         self.llm = llm
         self.loan_service = loan_service
         self.conversation_service = conversation_service
+        self.profiler = profiler or TurnProfiler()
         self.required_fields = ["applicant_name", "applicant_email", "amount", "purpose"]
 
     async def handle_turn(
+        self,
+        db: AsyncSession,
+        session_id: str | None,
+        user_reply: str | None,
+        profile: bool = False,
+    ) -> ChatResponse:
+        with self.profiler.turn(force=profile) as record:
+            response = await self._handle_turn(db, session_id, user_reply)
+            if record:
+                record.session_id = response.session_id
+        if record and record.kept:
+            response.profile_id = record.id
+        return response
+
+    async def _handle_turn(
         self, db: AsyncSession, session_id: str | None, user_reply: str | None
     ) -> ChatResponse:
-        state = await self.conversation_service.start_or_load(db, session_id)
+        with stage("db.load_state"):
+            state = await self.conversation_service.start_or_load(db, session_id)
         history = [
             msg if isinstance(msg, dict) else msg.model_dump() for msg in state.history
         ]
         if user_reply:
             history.append({"role": "user", "content": user_reply})
-            state = await self.conversation_service.update_state(
-                db,
-                state,
-                updates={"collected": {}},
-                append_message={"role": "user", "content": user_reply},
-            )
+            with stage("db.save_state"):
+                state = await self.conversation_service.update_state(
+                    db,
+                    state,
+                    updates={"collected": {}},
+                    append_message={"role": "user", "content": user_reply},
+                )
 
         if state.completed and state.loan_id:
-            loan = await self.loan_service.get_loan(db, state.loan_id)
+            with stage("db.load_loan"):
+                loan = await self.loan_service.get_loan(db, state.loan_id)
             return ChatResponse(
                 session_id=state.session_id,
                 next_question=None,
@@ -64,7 +85,8 @@ class AgentOrchestrator:
             )
 
         messages = [{"role": "system", "content": SYSTEM_PROMPT}] + history
-        llm_answer = await self.llm.chat(messages)
+        with stage("llm"):
+            llm_answer = await self.llm.chat(messages)
         try:
             parsed = json.loads(llm_answer)
         except json.JSONDecodeError:
@@ -116,10 +138,11 @@ class AgentOrchestrator:
                     collected.pop(field, None)
                 missing = [f for f in self.required_fields if f not in collected]
             else:
-                loan = await self.loan_service.create_loan(db, loan_payload)
-                state = await self.conversation_service.attach_loan(
-                    db, state, loan.id
-                )
+                with stage("db.create_loan"):
+                    loan = await self.loan_service.create_loan(db, loan_payload)
+                    state = await self.conversation_service.attach_loan(
+                        db, state, loan.id
+                    )
                 return ChatResponse(
                     session_id=state.session_id,
                     next_question=None,
@@ -131,12 +154,13 @@ class AgentOrchestrator:
 
         # Ask follow-up based on current missing fields (ignore stale LLM question)
         question = self._fallback_question(missing)
-        await self.conversation_service.update_state(
-            db,
-            state,
-            updates={"collected": collected},
-            append_message={"role": "assistant", "content": question},
-        )
+        with stage("db.save_state"):
+            await self.conversation_service.update_state(
+                db,
+                state,
+                updates={"collected": collected},
+                append_message={"role": "assistant", "content": question},
+            )
         return ChatResponse(
             session_id=state.session_id,
             next_question=question,
@@ -9,6 +9,21 @@ class Settings(BaseSettings):
     llm_model: str = Field(default="llama3")
     llm_base_url: str | None = Field(default=None)
     llm_api_key: str | None = Field(default=None)
+    # "live" talks to the model server; "record" also appends request/response
+    # pairs to llm_traffic_path; "replay" serves them back with no model server.
+    llm_mode: str = Field(default="live")
+    llm_traffic_path: str = Field(default="llm_traffic.jsonl")
+    # Replay pacing: 1.0 keeps recorded latencies, 10 plays 10x faster, 0 skips waits.
+    llm_replay_speed: float = Field(default=1.0)
+    # Strict replay raises on unrecorded requests instead of using the rule-based fallback.
+    llm_replay_strict: bool = Field(default=False)
+    # Turn profiling (app/profiling.py) is off unless enabled; a slow-turn
+    # threshold of 0 disables automatic capture.
+    profiling_enabled: bool = Field(default=False)
+    profiling_slow_turn_ms: float = Field(default=0)
+    profiling_buffer_size: int = Field(default=20)
+    profiling_sample_interval_ms: float = Field(default=5)
+    profiling_admin_token: str | None = Field(default=None)
     allow_origins: list[str] = Field(default=["*"])
 
     class Config:
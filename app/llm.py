@@ -1,24 +1,170 @@
+import asyncio
+import hashlib
 import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
 from typing import Any
 
 import httpx
 
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+
+class ReplayMissError(RuntimeError):
+    """Raised by a strict ReplayTransport when a request has no recording."""
+
+
+def _request_key(body: bytes) -> str:
+    """Stable key for a chat request: hash of the canonical JSON payload."""
+    try:
+        canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        canonical = body.decode("utf-8", errors="replace")
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a real transport and appends each request/response pair, with its
+    wall-clock latency, as one JSON line to `path`.
+    """
+
+    def __init__(self, path: str | Path, transport: httpx.AsyncBaseTransport | None = None):
+        self.path = Path(path)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self._file = None
+        self._lock = threading.Lock()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record = {
+            "key": _request_key(body),
+            "url": str(request.url),
+            "request": json.loads(body) if body else None,
+            "status_code": response.status_code,
+            "response": content.decode("utf-8", errors="replace"),
+            "elapsed_ms": round(elapsed_ms, 3),
+            "recorded_at": time.time(),
+        }
+        # File I/O runs off the event loop so recording doesn't stall other requests.
+        await asyncio.to_thread(self._write, json.dumps(record) + "\n")
+        # aread() already decoded the body, so drop the wire-level encoding headers.
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+        )
+
+    def _write(self, line: str) -> None:
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves responses captured by RecordingTransport without a model server.
+
+    Requests are matched on their payload hash; repeated identical requests get
+    the recorded responses in order (the last one is reused once exhausted).
+    `speed` scales recorded latencies: 1.0 original, 10 ten times faster, 0 no wait.
+    Unknown requests are counted in `misses` and logged; with `strict` they raise
+    ReplayMissError, otherwise they get a 404 and LLMClient falls back to its
+    rule-based path.
+    """
+
+    def __init__(self, path: str | Path, speed: float = 1.0, strict: bool = False):
+        self.speed = speed
+        self.strict = strict
+        self.misses = 0
+        self.records: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        with Path(path).open(encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    record = json.loads(line)
+                    self.records[record["key"]].append(record)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _request_key(await request.aread())
+        queue = self.records.get(key)
+        if not queue:
+            self.misses += 1
+            logger.warning("LLM replay miss #%d for request key %s", self.misses, key)
+            if self.strict:
+                raise ReplayMissError(f"No recorded LLM response for request key {key}")
+            return httpx.Response(
+                404, json={"error": "no recorded response"}, request=request
+            )
+        record = queue.popleft() if len(queue) > 1 else queue[0]
+        if self.speed > 0:
+            await asyncio.sleep(record["elapsed_ms"] / 1000 / self.speed)
+        return httpx.Response(
+            record["status_code"],
+            content=record["response"].encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            request=request,
+        )
+
+
+def _transport_for(mode: str) -> httpx.AsyncBaseTransport | None:
+    if mode == "record":
+        return RecordingTransport(settings.llm_traffic_path)
+    if mode == "replay":
+        return ReplayTransport(
+            settings.llm_traffic_path,
+            speed=settings.llm_replay_speed,
+            strict=settings.llm_replay_strict,
+        )
+    if mode != "live":
+        raise ValueError(f"Unknown LLM mode {mode!r}; expected live, record or replay")
+    return None
+
 
 class LLMClient:
     """
     Minimal OpenAI-compatible chat client.
     Works with local LLaMA runtimes such as Ollama/llama.cpp that expose /v1/chat/completions.
+    Set LOANBOT_LLM_MODE=record|replay to capture or replay traffic (see RecordingTransport).
     """
 
     def __init__(
-        self, model: str | None = None, base_url: str | None = None, api_key: str | None = None
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ):
         self.model = model or settings.llm_model
         self.base_url = base_url or settings.llm_base_url or "http://localhost:11434/v1"
         self.api_key = api_key or settings.llm_api_key
-        self.client = httpx.AsyncClient(timeout=60)
+        self.client = httpx.AsyncClient(
+            timeout=60, transport=transport or _transport_for(settings.llm_mode)
+        )
 
     async def chat(self, messages: list[dict[str, str]], temperature: float = 0.2) -> str:
         payload = {
@@ -37,6 +183,8 @@ class LLMClient:
             response.raise_for_status()
             data = response.json()
             return data["choices"][0]["message"]["content"]
+        except ReplayMissError:
+            raise
         except Exception:
             # Fallback deterministic prompt for offline runs.
             return self._rule_based(messages)
@@ -1,15 +1,27 @@
 import asyncio
-from fastapi import Depends, FastAPI
+from datetime import date
+
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import settings
-from .database import get_session, engine
+from .database import get_session, engine, SessionLocal
 from .models import Base
 from .services import LoanService, ConversationService
 from .agent import AgentOrchestrator
 from .llm import LLMClient
-from .schemas import ChatRequest, ChatResponse, LoanCreate, LoanRead
+from .profiling import admin_token_ok, parse_flag
+from .schemas import (
+    ChatRequest,
+    ChatResponse,
+    LoanCreate,
+    LoanRead,
+    LoanStats,
+    LoanStatusUpdate,
+    ProfilingArm,
+)
 
 app = FastAPI(title="LoanBot API", version="0.1.0")
 
@@ -31,6 +43,9 @@ async def startup_event():
     # Simple autoload for tables; swap with Alembic in production.
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Fills loan_rollups on first deploy against an existing `loans` table.
+    async with SessionLocal() as session:
+        await loan_service.backfill_stats(session)
 
 
 @app.post("/loans", response_model=LoanRead)
@@ -39,6 +54,70 @@ async def create_loan(payload: LoanCreate, db: AsyncSession = Depends(get_sessio
     return loan
 
 
+@app.get("/loans/stats", response_model=LoanStats)
+async def loan_stats(
+    since: date | None = None,
+    until: date | None = None,
+    purpose_limit: int = 10,
+    db: AsyncSession = Depends(get_session),
+):
+    try:
+        return await loan_service.get_stats(db, since, until, purpose_limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.patch("/loans/{loan_id}/status", response_model=LoanRead)
+async def update_loan_status(
+    loan_id: int, body: LoanStatusUpdate, db: AsyncSession = Depends(get_session)
+):
+    loan = await loan_service.update_status(db, loan_id, body.status)
+    if not loan:
+        raise HTTPException(status_code=404, detail=f"Loan {loan_id} not found")
+    return loan
+
+
 @app.post("/chat/llm-next", response_model=ChatResponse)
-async def llm_next(body: ChatRequest, db: AsyncSession = Depends(get_session)):
-    return await agent.handle_turn(db, body.session_id, body.user_reply)
+async def llm_next(
+    body: ChatRequest,
+    db: AsyncSession = Depends(get_session),
+    x_loanbot_profile: str | None = Header(default=None),
+    x_loanbot_admin_token: str | None = Header(default=None),
+):
+    # Per-request profiling is opt-in and gated by the admin token; a malformed
+    # debug header just leaves profiling off.
+    profile = parse_flag(x_loanbot_profile) and admin_token_ok(x_loanbot_admin_token)
+    return await agent.handle_turn(db, body.session_id, body.user_reply, profile=profile)
+
+
+def require_profiling_admin(x_loanbot_admin_token: str | None = Header(default=None)):
+    if not agent.profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not admin_token_ok(x_loanbot_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/admin/profiling/arm", dependencies=[Depends(require_profiling_admin)])
+async def arm_profiling(body: ProfilingArm):
+    return {"armed": agent.profiler.arm(body.turns)}
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_profiling_admin)])
+async def list_profiles():
+    return agent.profiler.summaries()
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_profiling_admin)])
+async def download_profile(profile_id: str, format: str = "json"):
+    record = agent.profiler.get(profile_id)
+    if not record:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    if format == "folded":
+        return PlainTextResponse(
+            record.folded(),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+        )
+    return JSONResponse(
+        record.to_dict(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.json"'},
+    )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Integer, Float, DateTime, JSON
+from sqlalchemy import String, Integer, Float, DateTime, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -50,3 +50,30 @@ class LoanSession(Base):
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
     )
+
+
+class LoanRollup(Base):
+    """
+    Incrementally maintained loan aggregates, one row per (dimension, bucket).
+    Dimensions are "total", "status", "purpose" (normalised text) and "day"
+    (created_at date, UTC).
+    Kept in sync by the repository on create/status change; rebuildable from `loans`.
+    """
+
+    __tablename__ = "loan_rollups"
+    __table_args__ = (
+        UniqueConstraint("dimension", "bucket"),
+        # Serves the top-N purpose query in LoanService.get_stats.
+        Index("ix_loan_rollups_dimension_count", "dimension", "count"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    dimension: Mapped[str] = mapped_column(String(20))
+    bucket: Mapped[str] = mapped_column(String(200))
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    total_amount: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
@@ -0,0 +1,263 @@
+"""
+Opt-in per-turn profiling for the agent loop.
+
+A turn is profiled when explicitly requested (header / MCP flag), when the
+profiler has been armed for the next N turns, or - if a slow-turn threshold is
+set - always, keeping the result only when the turn exceeds the threshold.
+Each profile holds a stage breakdown (LLM vs DB vs the rest) and the stack
+samples taken while that turn's task was running, in folded format
+(flamegraph.pl / speedscope). One sampler thread serves all concurrent turns.
+"""
+import asyncio
+import hmac
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Iterator
+
+from .config import settings
+
+_MAX_STACK_DEPTH = 64
+_MAX_WALK_DEPTH = 512
+_TRUE_FLAGS = {"1", "true", "yes", "on"}
+_current: ContextVar["TurnRecord | None"] = ContextVar("loanbot_turn_profile", default=None)
+
+
+def admin_token_ok(token: str | None) -> bool:
+    """Check a caller's admin token; no configured token means no admin access."""
+    expected = settings.profiling_admin_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+def parse_flag(value: str | None) -> bool:
+    """Lenient boolean for optional debug inputs: anything not true-like is off."""
+    return (value or "").strip().lower() in _TRUE_FLAGS
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Attribute wall time of the block to `name` on the active turn profile, if any."""
+    record = _current.get()
+    if record is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record.stages[name] = record.stages.get(name, 0.0) + elapsed_ms
+
+
+class _StackSampler:
+    """
+    One long-lived daemon thread that samples every thread with an active turn.
+
+    Each turn registers the root frame of its asyncio task; a sample is credited
+    to the turn whose root frame is on the sampled stack, i.e. the task that was
+    actually running. Samples taken while the loop is idle or running another
+    task are not attributed to anyone.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self._turns: dict[int, dict[FrameType, "TurnRecord"]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, thread_id: int, root: FrameType, record: "TurnRecord") -> None:
+        with self._lock:
+            self._turns.setdefault(thread_id, {})[root] = record
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="loanbot-sampler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def remove(self, thread_id: int, root: FrameType) -> None:
+        """Unregister a turn; once this returns the sampler no longer writes to it."""
+        with self._lock:
+            roots = self._turns.get(thread_id, {})
+            roots.pop(root, None)
+            if not roots:
+                self._turns.pop(thread_id, None)
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while True:
+            if not self._turns:
+                # Sleep until a turn registers; re-check after clearing to avoid a lost wake-up.
+                self._wake.clear()
+                if not self._turns:
+                    self._wake.wait()
+                last = time.perf_counter()
+                continue
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            elapsed_ms, last = (now - last) * 1000, now
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, roots in self._turns.items():
+                    self._attribute(frames.get(thread_id), roots, elapsed_ms)
+
+    @staticmethod
+    def _attribute(
+        frame: FrameType | None, roots: dict[FrameType, "TurnRecord"], elapsed_ms: float
+    ) -> None:
+        # Walk leaf -> task root first, so deep stacks are truncated at the leaf
+        # end and folded lines still share the same root frames.
+        frames: list[FrameType] = []
+        record = None
+        while frame is not None and len(frames) < _MAX_WALK_DEPTH:
+            frames.append(frame)
+            record = roots.get(frame)
+            if record is not None:
+                break
+            frame = frame.f_back
+        if record is None:
+            return
+        labels = [
+            f"{f.f_code.co_name} ({f.f_code.co_filename}:{f.f_lineno})"
+            for f in reversed(frames[-_MAX_STACK_DEPTH:])
+        ]
+        if len(frames) > _MAX_STACK_DEPTH:
+            labels.append("...truncated")
+        record.stacks[";".join(labels)] += 1
+        record.cpu_ms += elapsed_ms
+
+
+class TurnRecord:
+    def __init__(self, trigger: str | None):
+        self.id = uuid.uuid4().hex[:12]
+        self.trigger = trigger
+        self.session_id: str | None = None
+        self.started_at = datetime.now(timezone.utc)
+        self.stages: dict[str, float] = {}
+        self.wall_ms = 0.0
+        # Time this turn's task held the loop thread, estimated from attributed samples.
+        self.cpu_ms = 0.0
+        self.stacks: Counter[str] = Counter()
+        self.kept = False
+
+    def summary(self) -> dict[str, Any]:
+        accounted = sum(self.stages.values())
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "session_id": self.session_id,
+            "started_at": self.started_at.isoformat(),
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "stages": {k: round(v, 3) for k, v in self.stages.items()},
+            "unaccounted_ms": round(max(self.wall_ms - accounted, 0.0), 3),
+            "samples": sum(self.stacks.values()),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.summary() | {"stacks": self.folded().splitlines()}
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class TurnProfiler:
+    """
+    Captures turn profiles into a bounded in-memory ring buffer (oldest evicted first).
+    Everything is a no-op unless `enabled`; `slow_turn_ms=0` disables auto-capture.
+    """
+
+    def __init__(
+        self,
+        enabled: bool | None = None,
+        slow_turn_ms: float | None = None,
+        capacity: int | None = None,
+        sample_interval_ms: float | None = None,
+    ):
+        self.enabled = settings.profiling_enabled if enabled is None else enabled
+        self.slow_turn_ms = (
+            settings.profiling_slow_turn_ms if slow_turn_ms is None else slow_turn_ms
+        )
+        self.sample_interval_ms = (
+            settings.profiling_sample_interval_ms
+            if sample_interval_ms is None
+            else sample_interval_ms
+        )
+        self.profiles: deque[TurnRecord] = deque(
+            maxlen=capacity or settings.profiling_buffer_size
+        )
+        self._sampler = _StackSampler(self.sample_interval_ms)
+        self._armed = 0
+        self._lock = threading.Lock()
+
+    def arm(self, turns: int) -> int:
+        """Profile the next `turns` turns regardless of latency."""
+        with self._lock:
+            self._armed = max(turns, 0)
+            return self._armed
+
+    @contextmanager
+    def turn(self, force: bool = False) -> Iterator[TurnRecord | None]:
+        trigger = self._trigger(force)
+        if trigger is None:
+            yield None
+            return
+
+        record = TurnRecord(trigger)
+        token = _current.set(record)
+        thread_id, root = threading.get_ident(), _task_root_frame()
+        if root is not None:
+            self._sampler.add(thread_id, root, record)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_ms = (time.perf_counter() - started) * 1000
+            if root is not None:
+                self._sampler.remove(thread_id, root)
+            _current.reset(token)
+            record.kept = record.trigger != "slow" or record.wall_ms >= self.slow_turn_ms
+            if record.kept:
+                with self._lock:
+                    self.profiles.append(record)
+
+    def summaries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [record.summary() for record in reversed(self.profiles)]
+
+    def get(self, profile_id: str) -> TurnRecord | None:
+        with self._lock:
+            return next((r for r in self.profiles if r.id == profile_id), None)
+
+    def _trigger(self, force: bool) -> str | None:
+        if not self.enabled:
+            return None
+        if force:
+            return "request"
+        with self._lock:
+            if self._armed > 0:
+                self._armed -= 1
+                return "armed"
+        if self.slow_turn_ms > 0:
+            return "slow"
+        return None
+
+
+def _task_root_frame() -> FrameType | None:
+    """Outermost coroutine frame of the running asyncio task, if any."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return None
+    if task is None:
+        return None
+    return getattr(task.get_coro(), "cr_frame", None)
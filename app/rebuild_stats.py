@@ -0,0 +1,24 @@
+"""
+Rebuild the `loan_rollups` aggregates from `loans`.
+
+Usage: python -m app.rebuild_stats
+"""
+import asyncio
+import json
+
+from .database import SessionLocal, engine
+from .models import Base
+from .services import LoanService
+
+
+async def rebuild() -> dict:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as session:
+        stats = await LoanService().rebuild_stats(session)
+    await engine.dispose()
+    return stats.model_dump()
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(rebuild()), indent=2))
@@ -1,5 +1,7 @@
+from datetime import date, datetime
 from typing import Protocol
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import models
@@ -13,6 +15,22 @@ class LoanRepository(Protocol):
     async def get(self, session: AsyncSession, loan_id: int) -> models.Loan | None:
         ...
 
+    async def update_status(
+        self, session: AsyncSession, loan_id: int, status: str
+    ) -> models.Loan | None:
+        ...
+
+    async def stats(
+        self, session: AsyncSession, since: date, until: date, purpose_limit: int
+    ) -> list[models.LoanRollup]:
+        ...
+
+    async def rebuild_stats(self, session: AsyncSession) -> None:
+        ...
+
+    async def backfill_stats(self, session: AsyncSession) -> bool:
+        ...
+
 
 class SqlAlchemyLoanRepository:
     async def create(self, session: AsyncSession, payload: LoanCreate) -> models.Loan:
@@ -24,6 +42,11 @@ class SqlAlchemyLoanRepository:
             extra=payload.extra or {},
         )
         session.add(loan)
+        await session.flush()
+        # Rollups are bumped in the same transaction so they never drift from `loans`.
+        await _bump_rollups(
+            session, [(key, 1, loan.amount) for key in _rollup_keys(loan)]
+        )
         await session.commit()
         await session.refresh(loan)
         return loan
@@ -33,3 +56,185 @@ class SqlAlchemyLoanRepository:
             select(models.Loan).where(models.Loan.id == loan_id)
         )
         return result.scalar_one_or_none()
+
+    async def update_status(
+        self, session: AsyncSession, loan_id: int, status: str
+    ) -> models.Loan | None:
+        result = await session.execute(
+            select(models.Loan)
+            .where(models.Loan.id == loan_id)
+            .with_for_update()
+            # Re-read the locked row: an identity-map copy may hold a stale status.
+            .execution_options(populate_existing=True)
+        )
+        loan = result.scalar_one_or_none()
+        if not loan:
+            return None
+        if loan.status != status:
+            await _bump_rollups(
+                session,
+                [
+                    (("status", loan.status), -1, -loan.amount),
+                    (("status", status), 1, loan.amount),
+                ],
+            )
+            loan.status = status
+        await session.commit()
+        await session.refresh(loan)
+        return loan
+
+    async def stats(
+        self, session: AsyncSession, since: date, until: date, purpose_limit: int
+    ) -> list[models.LoanRollup]:
+        """
+        Rollup rows for a bounded response: the total, every status, the top
+        `purpose_limit` purposes by count and the days in [since, until].
+        """
+        rollup = models.LoanRollup
+        fixed = select(rollup).where(rollup.dimension.in_(["total", "status"]))
+        purposes = (
+            select(rollup)
+            .where(rollup.dimension == "purpose", rollup.count > 0)
+            .order_by(rollup.count.desc(), rollup.bucket)
+            .limit(purpose_limit)
+        )
+        # Day buckets are ISO dates, so string comparison is date order.
+        days = select(rollup).where(
+            rollup.dimension == "day",
+            rollup.bucket >= since.isoformat(),
+            rollup.bucket <= until.isoformat(),
+        )
+        rows: list[models.LoanRollup] = []
+        for query in (fixed, purposes, days):
+            result = await session.execute(query)
+            rows.extend(result.scalars().all())
+        return rows
+
+    async def backfill_stats(self, session: AsyncSession) -> bool:
+        """
+        Check the database supports rollups and rebuild them if `loan_rollups` is
+        empty while `loans` is not (first deploy on an existing database).
+        """
+        dialect = session.get_bind().dialect.name
+        if dialect not in _UPSERT_INSERTS:
+            raise RuntimeError(
+                f"Loan rollups need postgresql or sqlite; LOANBOT_DATABASE_URL uses {dialect}"
+            )
+        has_rollups = await session.scalar(select(models.LoanRollup.id).limit(1))
+        has_loans = await session.scalar(select(models.Loan.id).limit(1))
+        await session.commit()
+        if has_rollups is not None or has_loans is None:
+            return False
+        await self.rebuild_stats(session)
+        return True
+
+    async def rebuild_stats(self, session: AsyncSession) -> None:
+        """Recompute every rollup row from `loans` in a single transaction."""
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            # Block concurrent bumps until the rebuilt rows are committed; SQLite
+            # already serializes writers.
+            await session.execute(text("LOCK TABLE loan_rollups IN EXCLUSIVE MODE"))
+        await session.execute(delete(models.LoanRollup))
+        day = _day_expr(dialect)
+        groupings = [
+            ("total", None),
+            ("status", models.Loan.status),
+            ("purpose", models.Loan.purpose),
+            ("day", day),
+        ]
+        aggregates = [
+            func.count(models.Loan.id),
+            func.coalesce(func.sum(models.Loan.amount), 0.0),
+        ]
+        for dimension, column in groupings:
+            if column is None:
+                result = await session.execute(select(*aggregates))
+                rows = [("all", *result.one())]
+            else:
+                result = await session.execute(
+                    select(column, *aggregates).group_by(column)
+                )
+                rows = [(_bucket_str(dimension, r[0]), r[1], r[2]) for r in result.all()]
+            # Several raw purposes can normalise to one bucket, so merge first.
+            merged: dict[str, tuple[int, float]] = {}
+            for bucket, count, total in rows:
+                prev_count, prev_total = merged.get(bucket, (0, 0.0))
+                merged[bucket] = (prev_count + count, prev_total + float(total))
+            for bucket, (count, total) in merged.items():
+                if not count:
+                    continue
+                session.add(
+                    models.LoanRollup(
+                        dimension=dimension,
+                        bucket=bucket,
+                        count=count,
+                        total_amount=total,
+                    )
+                )
+        await session.commit()
+
+
+def _bucket_str(dimension: str, value) -> str:
+    if dimension == "purpose":
+        return purpose_bucket(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def purpose_bucket(purpose: str) -> str:
+    """Normalise free-text purposes (case, whitespace) so near-duplicates share a bucket."""
+    return " ".join(str(purpose).split()).casefold()[:200]
+
+
+def _rollup_keys(loan: models.Loan) -> list[tuple[str, str]]:
+    created = loan.created_at or datetime.utcnow()
+    return [
+        ("total", "all"),
+        ("status", loan.status or "pending"),
+        ("purpose", purpose_bucket(loan.purpose)),
+        ("day", created.date().isoformat()),
+    ]
+
+
+def _day_expr(dialect: str):
+    """SQL for the UTC day of `created_at`, matching `_rollup_keys`."""
+    if dialect == "postgresql":
+        # timestamptz -> date would otherwise use the session TimeZone.
+        return func.date(func.timezone("UTC", models.Loan.created_at))
+    return func.date(models.Loan.created_at)
+
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def _bump_rollups(
+    session: AsyncSession, deltas: list[tuple[tuple[str, str], int, float]]
+) -> None:
+    """
+    Apply (count, amount) deltas to rollup rows keyed by (dimension, bucket).
+    Each row is an atomic upsert (count = count + n), so concurrent writers neither
+    lose increments nor collide when creating a new bucket. Rows are touched in
+    sorted key order so concurrent transactions always lock them in the same order.
+    """
+    # Unsupported dialects are rejected at startup by backfill_stats.
+    insert = _UPSERT_INSERTS[session.get_bind().dialect.name]
+    table = models.LoanRollup
+    for (dimension, bucket), count, amount in sorted(deltas, key=lambda d: d[0]):
+        stmt = insert(table).values(
+            dimension=dimension,
+            bucket=bucket,
+            count=count,
+            total_amount=amount,
+            updated_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["dimension", "bucket"],
+            set_={
+                "count": table.count + stmt.excluded.count,
+                "total_amount": table.total_amount + stmt.excluded.total_amount,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await session.execute(stmt)
@@ -1,3 +1,5 @@
+from datetime import date
+
 from pydantic import BaseModel, EmailStr, Field
 from typing import Any, Literal
 
@@ -43,3 +45,27 @@ class ChatResponse(BaseModel):
     collected: dict[str, Any]
     completed: bool = False
     loan: LoanRead | None = None
+    profile_id: str | None = None
+
+
+class LoanStatusUpdate(BaseModel):
+    status: str = Field(..., min_length=1, max_length=50, examples=["approved"])
+
+
+class LoanStatBucket(BaseModel):
+    count: int = 0
+    total_amount: float = 0.0
+
+
+class LoanStats(BaseModel):
+    since: date
+    until: date
+    total: LoanStatBucket
+    by_status: dict[str, LoanStatBucket]
+    by_purpose: dict[str, LoanStatBucket]
+    other_purposes: LoanStatBucket
+    by_day: dict[str, LoanStatBucket]
+
+
+class ProfilingArm(BaseModel):
+    turns: int = Field(1, ge=0, le=1000)
@@ -1,4 +1,5 @@
 import uuid
+from datetime import date, datetime, timedelta
 from typing import Any
 
 from sqlalchemy import select
@@ -6,7 +7,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import models
 from .repository import LoanRepository, SqlAlchemyLoanRepository
-from .schemas import LoanCreate, ConversationState
+from .schemas import LoanCreate, ConversationState, LoanStatBucket, LoanStats
+
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+STATS_MAX_PURPOSES = 100
 
 
 class LoanService:
@@ -19,6 +24,69 @@ class LoanService:
     async def get_loan(self, session: AsyncSession, loan_id: int) -> models.Loan | None:
         return await self.repository.get(session, loan_id)
 
+    async def update_status(
+        self, session: AsyncSession, loan_id: int, status: str
+    ) -> models.Loan | None:
+        return await self.repository.update_status(session, loan_id, status)
+
+    async def get_stats(
+        self,
+        session: AsyncSession,
+        since: date | None = None,
+        until: date | None = None,
+        purpose_limit: int = 10,
+    ) -> LoanStats:
+        """
+        Portfolio totals over a bounded window (default: the last 30 days).
+        Raises ValueError for an inverted or over-long window or purpose limit.
+        """
+        until = until or datetime.utcnow().date()
+        since = since or until - timedelta(days=STATS_DEFAULT_DAYS - 1)
+        if since > until:
+            raise ValueError("since must not be after until")
+        if (until - since).days >= STATS_MAX_DAYS:
+            raise ValueError(f"Stats window is limited to {STATS_MAX_DAYS} days")
+        if not 0 <= purpose_limit <= STATS_MAX_PURPOSES:
+            raise ValueError(f"purpose_limit must be between 0 and {STATS_MAX_PURPOSES}")
+        rollups = await self.repository.stats(session, since, until, purpose_limit)
+        return self._to_stats(rollups, since, until)
+
+    async def rebuild_stats(self, session: AsyncSession) -> LoanStats:
+        await self.repository.rebuild_stats(session)
+        return await self.get_stats(session)
+
+    async def backfill_stats(self, session: AsyncSession) -> bool:
+        return await self.repository.backfill_stats(session)
+
+    def _to_stats(
+        self, rollups: list[models.LoanRollup], since: date, until: date
+    ) -> LoanStats:
+        stats = LoanStats(
+            since=since,
+            until=until,
+            total=LoanStatBucket(),
+            by_status={},
+            by_purpose={},
+            other_purposes=LoanStatBucket(),
+            by_day={},
+        )
+        groups = {"status": stats.by_status, "purpose": stats.by_purpose, "day": stats.by_day}
+        for row in rollups:
+            bucket = LoanStatBucket(count=row.count, total_amount=row.total_amount)
+            if row.dimension == "total":
+                stats.total = bucket
+            elif row.dimension in groups and row.count > 0:
+                groups[row.dimension][row.bucket] = bucket
+        # Purposes beyond the top N are folded into one bucket derived from the total.
+        shown = stats.by_purpose.values()
+        stats.other_purposes = LoanStatBucket(
+            count=stats.total.count - sum(b.count for b in shown),
+            total_amount=round(
+                stats.total.total_amount - sum(b.total_amount for b in shown), 6
+            ),
+        )
+        return stats
+
 
 class ConversationService:
     def __init__(self):
@@ -1,4 +1,6 @@
 import os
+from datetime import date
+
 from mcp.server.fastmcp import FastMCP
 
 from app.llm import LLMClient
@@ -6,6 +8,7 @@ from app.services import LoanService, ConversationService
 from app.agent import AgentOrchestrator
 from app.database import SessionLocal, engine
 from app.models import Base
+from app.profiling import admin_token_ok
 
 MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "streamable-http")
 MCP_HOST = os.getenv("MCP_HOST", "0.0.0.0")
@@ -35,35 +38,113 @@ async def list_loans() -> list[dict]:
 
 
 @mcp.tool()
-async def process_email(email_text: str) -> dict:
+async def loan_stats(
+    since: str | None = None, until: str | None = None, purpose_limit: int = 10
+) -> dict:
+    """
+    Loan totals by status, top purposes, and day (ISO dates, default last 30 days),
+    served from the rollup table.
+    """
+    async for db in _session():
+        await _ensure_tables()
+        try:
+            stats = await loan_service.get_stats(
+                db,
+                since=date.fromisoformat(since) if since else None,
+                until=date.fromisoformat(until) if until else None,
+                purpose_limit=purpose_limit,
+            )
+        except ValueError as exc:
+            return {"error": str(exc)}
+        return stats.model_dump(mode="json")
+    return {}
+
+
+@mcp.tool()
+async def process_email(
+    email_text: str, profile: bool = False, admin_token: str | None = None
+) -> dict:
     """
     Fully automated run: feed an email text, let the LLaMA agent ask questions if needed,
     and save the loan once all fields are present.
+    Set profile=True with the profiling admin token to profile every turn of the run.
     """
+    profile = profile and admin_token_ok(admin_token)
     async for db in _session():
         await _ensure_tables()
+        profile_ids: list[str] = []
         # Seed the conversation with the email text as first user message.
-        response = await agent.handle_turn(db, session_id=None, user_reply=email_text)
+        response = await agent.handle_turn(
+            db, session_id=None, user_reply=email_text, profile=profile
+        )
+        if response.profile_id:
+            profile_ids.append(response.profile_id)
         # Loop a few times, reusing the email text so heuristic extraction can fill fields.
         for _ in range(6):
             if response.completed or not response.pending_fields:
                 break
             response = await agent.handle_turn(
-                db, response.session_id, user_reply=email_text
+                db, response.session_id, user_reply=email_text, profile=profile
             )
+            if response.profile_id:
+                profile_ids.append(response.profile_id)
         return {
             "session_id": response.session_id,
             "completed": response.completed,
             "pending": response.pending_fields,
             "collected": response.collected,
             "loan": response.loan.model_dump() if response.loan else None,
+            "profile_ids": profile_ids,
         }
     return {}
 
 
+def _profiling_denied(admin_token: str | None) -> dict | None:
+    """Same gate as the API's admin endpoints: profiling enabled and a valid token."""
+    if not agent.profiler.enabled:
+        return {"error": "profiling is disabled"}
+    if not admin_token_ok(admin_token):
+        return {"error": "invalid admin token"}
+    return None
+
+
+@mcp.tool()
+async def arm_profiler(admin_token: str, turns: int = 1) -> dict:
+    """Profile the next N agent turns (requires profiling and the admin token)."""
+    if denied := _profiling_denied(admin_token):
+        return denied
+    return {"armed": agent.profiler.arm(turns)}
+
+
+@mcp.tool()
+async def list_profiles(admin_token: str) -> dict:
+    """List captured turn profiles (newest first): stage breakdown without stacks."""
+    if denied := _profiling_denied(admin_token):
+        return denied
+    return {"profiles": agent.profiler.summaries()}
+
+
+@mcp.tool()
+async def get_profile(admin_token: str, profile_id: str) -> dict:
+    """Download one captured turn profile, including folded stack samples."""
+    if denied := _profiling_denied(admin_token):
+        return denied
+    record = agent.profiler.get(profile_id)
+    return record.to_dict() if record else {}
+
+
+_stats_backfilled = False
+
+
 async def _ensure_tables():
+    global _stats_backfilled
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    if not _stats_backfilled:
+        # Fills loan_rollups on first deploy against an existing `loans` table.
+        async with SessionLocal() as session:
+            await loan_service.backfill_stats(session)
+        _stats_backfilled = True
 
 
 if __name__ == "__main__":
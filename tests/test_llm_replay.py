@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.llm import (
+    LLMClient,
+    RecordingTransport,
+    ReplayMissError,
+    ReplayTransport,
+    _request_key,
+)
+
+MESSAGES = [{"role": "user", "content": "I need a loan"}]
+ANSWER = '{"action":"ask","question":"Name?","missing":["applicant_name"],"collected":{}}'
+
+
+def _model_server(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": ANSWER}}]})
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+
+    async def record():
+        transport = RecordingTransport(path, transport=httpx.MockTransport(_model_server))
+        client = LLMClient(model="llama3", base_url="http://llm/v1", transport=transport)
+        answer = await client.chat(MESSAGES)
+        await client.client.aclose()
+        return answer
+
+    async def replay():
+        transport = ReplayTransport(path, speed=0, strict=True)
+        client = LLMClient(model="llama3", base_url="http://llm/v1", transport=transport)
+        return await client.chat(MESSAGES), transport.misses
+
+    assert asyncio.run(record()) == ANSWER
+
+    [line] = path.read_text(encoding="utf-8").splitlines()
+    record = json.loads(line)
+    payload = {"model": "llama3", "messages": MESSAGES, "temperature": 0.2}
+    assert record["key"] == _request_key(json.dumps(payload).encode("utf-8"))
+    assert record["url"] == "http://llm/v1/chat/completions"
+    assert record["request"] == payload
+    assert record["status_code"] == 200
+    assert json.loads(record["response"])["choices"][0]["message"]["content"] == ANSWER
+    assert record["elapsed_ms"] >= 0
+
+    assert asyncio.run(replay()) == (ANSWER, 0)
+
+
+def test_replay_miss_raises_when_strict(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    path.write_text("", encoding="utf-8")
+
+    async def run(strict: bool):
+        transport = ReplayTransport(path, speed=0, strict=strict)
+        client = LLMClient(model="llama3", base_url="http://llm/v1", transport=transport)
+        return await client.chat(MESSAGES), transport.misses
+
+    with pytest.raises(ReplayMissError):
+        asyncio.run(run(strict=True))
+
+    answer, misses = asyncio.run(run(strict=False))
+    assert misses == 1
+    assert json.loads(answer)["action"] == "ask"
@@ -0,0 +1,157 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base, Loan
+from app.schemas import LoanCreate
+from app.services import LoanService
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _with_sessions(tmp_path, fn):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'loans.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        return await fn(async_sessionmaker(engine, expire_on_commit=False))
+    finally:
+        await engine.dispose()
+
+
+def _payload(name: str, amount: float, purpose: str) -> LoanCreate:
+    return LoanCreate(
+        applicant_name=name,
+        applicant_email=f"{name.lower()}@example.com",
+        amount=amount,
+        purpose=purpose,
+    )
+
+
+def test_incremental_rollups_match_rebuild(tmp_path):
+    service = LoanService()
+
+    async def scenario(sessions):
+        async with sessions() as session:
+            loans = [
+                await service.create_loan(session, _payload("Alex", 1000, "Working capital")),
+                await service.create_loan(session, _payload("Sam", 250.5, "Equipment")),
+                await service.create_loan(session, _payload("Kim", 4000, " working  CAPITAL ")),
+            ]
+            await service.update_status(session, loans[0].id, "approved")
+            await service.update_status(session, loans[1].id, "rejected")
+            await service.update_status(session, loans[1].id, "pending")
+            await service.update_status(session, loans[2].id, "approved")
+            await service.update_status(session, loans[2].id, "approved")
+            incremental = await service.get_stats(session)
+            rebuilt = await service.rebuild_stats(session)
+            return incremental, rebuilt
+
+    incremental, rebuilt = _run(_with_sessions(tmp_path, scenario))
+
+    assert incremental == rebuilt
+    assert incremental.total.count == 3
+    assert incremental.total.total_amount == 5250.5
+    assert incremental.by_status["approved"].count == 2
+    assert incremental.by_status["pending"].count == 1
+    assert "rejected" not in incremental.by_status
+    assert incremental.by_purpose["working capital"].total_amount == 5000
+    assert sum(b.count for b in incremental.by_day.values()) == 3
+
+
+def test_status_change_from_stale_session_uses_current_status(tmp_path):
+    service = LoanService()
+
+    async def scenario(sessions):
+        async with sessions() as s1, sessions() as s2:
+            loan = await service.create_loan(s1, _payload("Alex", 1000, "Equipment"))
+            await service.update_status(s2, loan.id, "approved")
+            # s1 still holds the Loan with status "pending" in its identity map.
+            await service.update_status(s1, loan.id, "rejected")
+            incremental = await service.get_stats(s1)
+            rebuilt = await service.rebuild_stats(s1)
+            return incremental, rebuilt
+
+    incremental, rebuilt = _run(_with_sessions(tmp_path, scenario))
+
+    assert incremental == rebuilt
+    assert set(incremental.by_status) == {"rejected"}
+
+
+def test_stats_response_is_bounded(tmp_path):
+    service = LoanService()
+
+    async def scenario(sessions):
+        async with sessions() as session:
+            for i in range(5):
+                await service.create_loan(session, _payload(f"A{i}", 100, f"purpose {i % 3}"))
+            session.add(
+                Loan(
+                    applicant_name="Old",
+                    applicant_email="old@example.com",
+                    amount=50,
+                    purpose="purpose 0",
+                    created_at=datetime.utcnow() - timedelta(days=90),
+                )
+            )
+            await session.commit()
+            await service.rebuild_stats(session)
+            return await service.get_stats(session, purpose_limit=1)
+
+    stats = _run(_with_sessions(tmp_path, scenario))
+
+    assert stats.until - stats.since == timedelta(days=29)
+    assert list(stats.by_purpose) == ["purpose 0"]
+    assert stats.other_purposes.count == 3
+    assert stats.total.count == 6
+    assert sum(b.count for b in stats.by_day.values()) == 5
+
+
+def test_backfill_fills_empty_rollups_once(tmp_path):
+    service = LoanService()
+
+    async def scenario(sessions):
+        async with sessions() as session:
+            session.add(
+                Loan(
+                    applicant_name="Alex",
+                    applicant_email="alex@example.com",
+                    amount=1000,
+                    purpose="Equipment",
+                )
+            )
+            await session.commit()
+            first = await service.backfill_stats(session)
+            second = await service.backfill_stats(session)
+            return first, second, await service.get_stats(session)
+
+    first, second, stats = _run(_with_sessions(tmp_path, scenario))
+
+    assert (first, second) == (True, False)
+    assert stats.total.count == 1
+    assert stats.by_status["pending"].count == 1
+
+
+def test_invalid_stats_window_is_rejected(tmp_path):
+    service = LoanService()
+
+    async def scenario(sessions):
+        async with sessions() as session:
+            await service.get_stats(session, since=date(2026, 2, 1), until=date(2026, 1, 1))
+
+    with pytest.raises(ValueError):
+        _run(_with_sessions(tmp_path, scenario))
+
+
+def test_update_status_unknown_loan_returns_none(tmp_path):
+    service = LoanService()
+
+    async def scenario(sessions):
+        async with sessions() as session:
+            return await service.update_status(session, 404, "approved")
+
+    assert _run(_with_sessions(tmp_path, scenario)) is None
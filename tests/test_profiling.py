@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import threading
+import time
+
+from app import profiling
+from app.profiling import TurnProfiler, TurnRecord, _StackSampler, parse_flag, stage
+
+
+def burn(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _turn(profiler: TurnProfiler, work) -> object:
+    with profiler.turn(force=True) as record:
+        await work()
+    return record
+
+
+def test_samples_are_attributed_to_the_running_turn():
+    profiler = TurnProfiler(enabled=True, slow_turn_ms=0, capacity=50, sample_interval_ms=2)
+
+    async def waiter():
+        with stage("llm"):
+            await asyncio.sleep(0.3)
+
+    async def cpu():
+        await asyncio.sleep(0.01)
+        with stage("cpu"):
+            burn(0.2)
+
+    async def main():
+        threads_before = threading.active_count()
+        tasks = [asyncio.create_task(_turn(profiler, waiter)) for _ in range(20)]
+        tasks.append(asyncio.create_task(_turn(profiler, cpu)))
+        await asyncio.sleep(0.05)
+        sampler_threads = threading.active_count() - threads_before
+        return await asyncio.gather(*tasks), sampler_threads
+
+    records, sampler_threads = asyncio.run(main())
+    *waiters, busy = records
+
+    assert sampler_threads == 1
+    assert busy.cpu_ms > 100
+    assert any("burn" in stack for stack in busy.stacks)
+    for record in waiters:
+        assert record.cpu_ms < 50
+        assert not any("burn" in stack for stack in record.stacks)
+        assert record.stages["llm"] >= 300
+
+
+def test_slow_turn_capture_keeps_only_slow_turns_in_bounded_buffer():
+    profiler = TurnProfiler(enabled=True, slow_turn_ms=30, capacity=2, sample_interval_ms=2)
+
+    async def unforced(seconds: float):
+        with profiler.turn() as record:
+            await asyncio.sleep(seconds)
+        return record
+
+    fast = asyncio.run(unforced(0.001))
+    assert fast.trigger == "slow" and not fast.kept
+
+    for _ in range(3):
+        slow = asyncio.run(unforced(0.04))
+        assert slow.kept
+
+    assert [p["id"] for p in profiler.summaries()][0] == slow.id
+    assert len(profiler.summaries()) == 2
+
+
+def test_disabled_profiler_is_a_no_op():
+    profiler = TurnProfiler(enabled=False)
+
+    async def main():
+        with profiler.turn(force=True) as record:
+            with stage("llm"):
+                await asyncio.sleep(0)
+        return record
+
+    assert asyncio.run(main()) is None
+    assert profiler.summaries() == []
+
+
+def test_deep_stacks_are_truncated_at_the_leaf_end():
+    record = TurnRecord("request")
+
+    def recurse(depth: int):
+        return recurse(depth - 1) if depth else sys._getframe()
+
+    async def turn_root():
+        leaf = recurse(100)
+        root = asyncio.current_task().get_coro().cr_frame
+        _StackSampler._attribute(leaf, {root: record}, 1.0)
+
+    asyncio.run(turn_root())
+
+    [stack] = record.stacks
+    frames = stack.split(";")
+    assert frames[0].startswith("turn_root ")
+    assert frames[-1] == "...truncated"
+    assert len(frames) == profiling._MAX_STACK_DEPTH + 1
+    assert record.cpu_ms == 1.0
+
+
+def test_parse_flag_is_lenient():
+    assert parse_flag("true") and parse_flag(" 1 ") and parse_flag("YES")
+    for value in (None, "", "0", "false", "off", "please"):
+        assert not parse_flag(value)
+
+
+def test_admin_token_required_and_compared(monkeypatch):
+    monkeypatch.setattr(profiling.settings, "profiling_admin_token", None)
+    assert not profiling.admin_token_ok("anything")
+
+    monkeypatch.setattr(profiling.settings, "profiling_admin_token", "s3cret")
+    assert profiling.admin_token_ok("s3cret")
+    assert not profiling.admin_token_ok("wrong")
+    assert not profiling.admin_token_ok(None)